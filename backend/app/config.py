@@ -1,33 +1,76 @@
 """
 Configuration management for Sovereign Sentinel backend.
 """
-from pydantic_settings import BaseSettings
-from typing import Optional
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
 
+import msgspec
 
-class Settings(BaseSettings):
+
+class Settings(msgspec.Struct, frozen=True):
     """Application settings loaded from environment variables."""
-    
+
     # API Keys
     you_api_key: str
     openai_api_key: str
-    composio_api_key: Optional[str] = None  # New
-    
+    composio_api_key: Optional[str] = None
+
     # Application Settings
     environment: str = "development"
     log_level: str = "INFO"
     scan_interval_minutes: int = 15
-    
+
     # Cache Settings
     cache_ttl_seconds: int = 3600  # 1 hour
-    
+
     # Risk Score Settings
     risk_threshold: int = 70
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
+def _read_env_file(path: Path) -> Dict[str, str]:
+    """Read KEY=VALUE pairs from a .env file, ignoring comments and blanks."""
+    values: Dict[str, str] = {}
+    if not path.exists():
+        return values
+
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, _, value = line.partition('=')
+        values[key.strip().lower()] = value.strip().strip('"').strip("'")
+
+    return values
+
+
+def load_settings(env_file: str = ".env") -> Settings:
+    """
+    Build a Settings instance from the environment.
+
+    Values are resolved case-insensitively, with real environment variables
+    taking precedence over entries in the .env file.
+
+    Args:
+        env_file: Path to an optional .env file
+
+    Returns:
+        Validated Settings instance
+    """
+    values = _read_env_file(Path(env_file))
+
+    for key, value in os.environ.items():
+        values[key.lower()] = value
+
+    fields = set(Settings.__struct_fields__)
+    config = {key: value for key, value in values.items() if key in fields}
+
+    # strict=False coerces string env values into the annotated field types
+    return msgspec.convert(config, Settings, strict=False)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the application settings, loaded and cached on first use."""
+    return load_settings()
@@ -4,6 +4,7 @@ Forensic Auditor: Analyzes loan portfolio data and flags high-risk PIK loans.
 import json
 import logging
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Union
 
@@ -14,6 +15,9 @@ from app.models import LoanRecord, FlaggedLoan
 
 logger = logging.getLogger(__name__)
 
+# Sort key bound once instead of a fresh lambda per ranking call
+_BY_EXPOSURE = attrgetter('outstanding_balance')
+
 
 class ForensicAuditor:
     """Analyzes loan portfolios and identifies high-risk PIK loans."""
@@ -200,10 +204,30 @@ class ForensicAuditor:
         Returns:
             Sorted list of flagged loans (highest exposure first)
         """
-        ranked = sorted(flagged_loans, key=lambda loan: loan.outstanding_balance, reverse=True)
+        ranked = sorted(flagged_loans, key=_BY_EXPOSURE, reverse=True)
         logger.info(f"Ranked {len(ranked)} flagged loans by exposure")
         return ranked
-    
+
+    def rank_and_dump(self, flagged_loans: List[FlaggedLoan]) -> List[dict]:
+        """
+        Rank flagged loans by exposure and serialize them in a single pass.
+
+        Fuses `rank_by_exposure` with the per-loan `model_dump()` the API
+        endpoints previously did separately, avoiding an intermediate list.
+
+        Args:
+            flagged_loans: List of flagged loans
+
+        Returns:
+            List of dumped loan dicts sorted by outstanding balance (descending)
+        """
+        # mode='json' yields primitives the response encoder can serialize
+        # without another jsonable_encoder pass
+        return [
+            loan.model_dump(mode='json')
+            for loan in sorted(flagged_loans, key=_BY_EXPOSURE, reverse=True)
+        ]
+
     def analyze_portfolio(
         self,
         file_path: Union[str, Path],
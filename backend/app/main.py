@@ -1,12 +1,15 @@
 """
 Main FastAPI application for Sovereign Sentinel backend.
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import settings
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from app.config import get_settings
 from app.you_client import YouAPIClient
 from app.osint_scout import OSINTScout
 from app.scheduler import ScanScheduler
@@ -17,45 +20,40 @@ from app.forensic_auditor import ForensicAuditor
 
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, settings.log_level),
+    level=getattr(logging, get_settings().log_level),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
-# Global instances
-you_client: YouAPIClient = None
-osint_scout: OSINTScout = None
-scheduler: ScanScheduler = None
-research_agent: ResearchAgent = None
-financial_agent: FinancialAnalysisAgent = None
-forensic_auditor: ForensicAuditor = None
-
+# Batch validator for extracted loan dicts; built once so bulk
+# deserialization reuses the compiled schema
+_LOANS_ADAPTER = TypeAdapter(List[LoanRecord])
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
-    global you_client, osint_scout, scheduler, research_agent, financial_agent, forensic_auditor
-    
     logger.info("Starting Sovereign Sentinel backend...")
     
     # Initialize You.com client
-    you_client = YouAPIClient(api_key=settings.you_api_key)
+    settings = get_settings()
+    app.state.you_client = YouAPIClient(api_key=settings.you_api_key)
     logger.info("You.com API client initialized")
     
     # Initialize OSINT Scout
-    osint_scout = OSINTScout(you_client=you_client)
+    app.state.osint_scout = OSINTScout(you_client=app.state.you_client)
     logger.info("OSINT Scout initialized")
     
     # Initialize and start scheduler
-    scheduler = ScanScheduler(osint_scout=osint_scout)
-    scheduler.start()
+    app.state.scheduler = ScanScheduler(osint_scout=app.state.osint_scout)
+    app.state.scheduler.start()
     logger.info("Scheduler started")
     
     # Initialize Research Agent (Composio)
+    app.state.research_agent = None
     if settings.composio_api_key:
         try:
-            research_agent = ResearchAgent(composio_api_key=settings.composio_api_key)
+            app.state.research_agent = ResearchAgent(composio_api_key=settings.composio_api_key)
             logger.info("Research Agent (Composio) initialized")
         except Exception as e:
             logger.warning(f"Failed to initialize Research Agent: {e}")
@@ -64,19 +62,19 @@ async def lifespan(app: FastAPI):
     
     # Initialize Financial Analysis Agent
     try:
-        financial_agent = FinancialAnalysisAgent()
+        app.state.financial_agent = FinancialAnalysisAgent()
         logger.info("Financial Analysis Agent initialized")
     except Exception as e:
         logger.warning(f"Failed to initialize Financial Analysis Agent: {e}")
-        financial_agent = None
+        app.state.financial_agent = None
     
     # Initialize Forensic Auditor
-    forensic_auditor = ForensicAuditor()
+    app.state.forensic_auditor = ForensicAuditor()
     logger.info("Forensic Auditor initialized")
     
     # Run initial scan
     try:
-        await scheduler.run_immediate_scan()
+        await app.state.scheduler.run_immediate_scan()
         logger.info("Initial scan completed")
     except Exception as e:
         logger.error(f"Initial scan failed: {e}")
@@ -85,8 +83,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Sovereign Sentinel backend...")
-    if scheduler:
-        scheduler.stop()
+    app.state.scheduler.stop()
     logger.info("Shutdown complete")
 
 
@@ -95,7 +92,10 @@ app = FastAPI(
     title="Sovereign Sentinel API",
     description="Financial War Room system for detecting Shadow Defaults",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes large flagged-loan payloads several times faster
+    # than the stdlib encoder and emits bytes directly
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -108,6 +108,84 @@ app.add_middleware(
 )
 
 
+def get_osint_scout(request: Request) -> Optional[OSINTScout]:
+    """Dependency: the OSINT Scout, or None before startup completes."""
+    return getattr(request.app.state, 'osint_scout', None)
+
+
+def get_scheduler(request: Request) -> ScanScheduler:
+    """Dependency: the scan scheduler (503 if not initialized)."""
+    scheduler = getattr(request.app.state, 'scheduler', None)
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    return scheduler
+
+
+def get_research_agent(request: Request) -> ResearchAgent:
+    """Dependency: the Research Agent (503 if not initialized)."""
+    agent = getattr(request.app.state, 'research_agent', None)
+    if agent is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Research Agent not initialized. Set COMPOSIO_API_KEY in environment."
+        )
+    return agent
+
+
+def get_financial_agent(request: Request) -> FinancialAnalysisAgent:
+    """Dependency: the Financial Analysis Agent (503 if not initialized)."""
+    agent = getattr(request.app.state, 'financial_agent', None)
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Financial Analysis Agent not initialized")
+    return agent
+
+
+def get_forensic_auditor(request: Request) -> ForensicAuditor:
+    """Dependency: the Forensic Auditor (503 if not initialized)."""
+    auditor = getattr(request.app.state, 'forensic_auditor', None)
+    if auditor is None:
+        raise HTTPException(status_code=503, detail="Forensic Auditor not initialized")
+    return auditor
+
+
+def _build_risk_context(assessment: Optional[RiskAssessment]) -> dict:
+    """Build the analysis risk context from a risk assessment."""
+    return {
+        "global_risk_score": assessment.global_risk_score if assessment else 0,
+        "affected_sectors": assessment.affected_sectors if assessment else [],
+        "sentiment": assessment.sentiment if assessment else "neutral",
+        "correlated_event": "Current geopolitical events"
+    }
+
+
+# (cache key, context dict) for the last assessment revision seen
+_risk_context_cache = (None, None)
+
+
+def _current_risk_context(osint_scout: Optional[OSINTScout]) -> dict:
+    """
+    Return the risk context for the latest assessment.
+
+    The built dict is cached per assessment revision (identity + timestamp),
+    so repeated analysis requests between scans reuse the same context
+    instead of refetching the assessment attributes.
+    """
+    global _risk_context_cache
+
+    assessment = osint_scout.get_latest_assessment() if osint_scout else None
+    if assessment is None:
+        return _build_risk_context(None)
+
+    key = (id(assessment), assessment.timestamp)
+    cached_key, cached_context = _risk_context_cache
+    if key == cached_key:
+        return cached_context
+
+    context = _build_risk_context(assessment)
+    _risk_context_cache = (key, context)
+    return context
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -119,19 +197,23 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
+    state = request.app.state
+    scheduler = getattr(state, 'scheduler', None)
     return {
         "status": "healthy",
         "scheduler_running": scheduler.is_running if scheduler else False,
-        "environment": settings.environment,
-        "research_agent_available": research_agent is not None,
-        "financial_agent_available": financial_agent is not None
+        "environment": get_settings().environment,
+        "research_agent_available": getattr(state, 'research_agent', None) is not None,
+        "financial_agent_available": getattr(state, 'financial_agent', None) is not None
     }
 
 
 @app.get("/api/risk/latest", response_model=RiskAssessment)
-async def get_latest_risk_assessment():
+async def get_latest_risk_assessment(
+    osint_scout: Optional[OSINTScout] = Depends(get_osint_scout)
+):
     """
     Get the latest risk assessment.
     
@@ -150,16 +232,16 @@ async def get_latest_risk_assessment():
 
 
 @app.post("/api/scan/immediate", response_model=RiskAssessment)
-async def trigger_immediate_scan():
+async def trigger_immediate_scan(
+    scheduler: ScanScheduler = Depends(get_scheduler),
+    osint_scout: Optional[OSINTScout] = Depends(get_osint_scout)
+):
     """
     Trigger an immediate OSINT scan.
     
     Returns:
         RiskAssessment from the scan
     """
-    if not scheduler:
-        raise HTTPException(status_code=503, detail="Scheduler not initialized")
-    
     try:
         await scheduler.run_immediate_scan()
         assessment = osint_scout.get_latest_assessment()
@@ -175,20 +257,22 @@ async def trigger_immediate_scan():
 
 
 @app.get("/api/scan/status")
-async def get_scan_status():
+async def get_scan_status(
+    scheduler: ScanScheduler = Depends(get_scheduler),
+    osint_scout: Optional[OSINTScout] = Depends(get_osint_scout)
+):
     """
     Get the status of the scanning scheduler.
     
     Returns:
         Scheduler status information
     """
-    if not scheduler:
-        raise HTTPException(status_code=503, detail="Scheduler not initialized")
-    
     return {
         "is_running": scheduler.is_running,
-        "interval_minutes": settings.scan_interval_minutes,
-        "latest_assessment_available": osint_scout.get_latest_assessment() is not None
+        "interval_minutes": get_settings().scan_interval_minutes,
+        "latest_assessment_available": (
+            osint_scout.get_latest_assessment() is not None if osint_scout else False
+        )
     }
 
 
@@ -196,7 +280,8 @@ async def get_scan_status():
 async def extract_financial_data(
     source: str,  # "xero" | "quickbooks" | "stripe"
     connection_id: str,
-    tenant_id: Optional[str] = None
+    tenant_id: Optional[str] = None,
+    research_agent: ResearchAgent = Depends(get_research_agent)
 ):
     """
     Extract financial data from external source using Research Agent.
@@ -206,12 +291,6 @@ async def extract_financial_data(
         connection_id: OAuth connection ID
         tenant_id: Tenant ID (required for Xero and QuickBooks)
     """
-    if not research_agent:
-        raise HTTPException(
-            status_code=503, 
-            detail="Research Agent not initialized. Set COMPOSIO_API_KEY in environment."
-        )
-    
     try:
         if source == "xero":
             if not tenant_id:
@@ -242,7 +321,10 @@ async def extract_financial_data(
 @app.post("/api/analysis/analyze")
 async def analyze_portfolio(
     loans: List[LoanRecord],
-    use_ai: bool = True
+    use_ai: bool = True,
+    osint_scout: Optional[OSINTScout] = Depends(get_osint_scout),
+    financial_agent: FinancialAnalysisAgent = Depends(get_financial_agent),
+    forensic_auditor: ForensicAuditor = Depends(get_forensic_auditor)
 ):
     """
     Analyze loan portfolio using Financial Analysis Agent or Forensic Auditor.
@@ -251,38 +333,30 @@ async def analyze_portfolio(
         loans: List of loans to analyze
         use_ai: If True, uses Financial Analysis Agent, if False uses traditional Forensic Auditor
     """
-    if not financial_agent:
-        raise HTTPException(status_code=503, detail="Financial Analysis Agent not initialized")
-    
     try:
         # Get current risk context
-        latest_assessment = osint_scout.get_latest_assessment() if osint_scout else None
-        risk_context = {
-            "global_risk_score": latest_assessment.global_risk_score if latest_assessment else 0,
-            "affected_sectors": latest_assessment.affected_sectors if latest_assessment else [],
-            "sentiment": latest_assessment.sentiment if latest_assessment else "neutral",
-            "correlated_event": "Current geopolitical events"
-        }
-        
-        if use_ai and financial_agent:
+        risk_context = _current_risk_context(osint_scout)
+
+        if use_ai:
             # Usar Financial Analysis Agent
             flagged = await financial_agent.analyze_portfolio(loans, risk_context)
+            ranked = forensic_auditor.rank_and_dump(flagged)
         else:
-            # Usar Forensic Auditor tradicional
-            flagged = forensic_auditor.flag_high_risk_loans(
+            # Usar Forensic Auditor tradicional; the auditor is synchronous
+            # CPU work, so run it in a thread to keep the event loop free
+            flagged = await asyncio.to_thread(
+                forensic_auditor.flag_high_risk_loans,
                 loans,
                 risky_sectors=["energy", "currency", "sovereign debt"],
                 correlated_event=risk_context.get("correlated_event", "Geopolitical crisis")
             )
-        
-        # Rankear por exposición
-        ranked = forensic_auditor.rank_by_exposure(flagged)
-        
+            ranked = await asyncio.to_thread(forensic_auditor.rank_and_dump, flagged)
+
         return {
             "total_loans": len(loans),
             "flagged_count": len(flagged),
             "analysis_method": "ai" if use_ai else "traditional",
-            "flagged_loans": [loan.model_dump() for loan in ranked]
+            "flagged_loans": ranked
         }
     except Exception as e:
         logger.error(f"Error analyzing portfolio: {e}")
@@ -294,7 +368,11 @@ async def extract_and_analyze(
     source: str,
     connection_id: str,
     tenant_id: Optional[str] = None,
-    use_ai: bool = True
+    use_ai: bool = True,
+    research_agent: ResearchAgent = Depends(get_research_agent),
+    osint_scout: Optional[OSINTScout] = Depends(get_osint_scout),
+    financial_agent: FinancialAnalysisAgent = Depends(get_financial_agent),
+    forensic_auditor: ForensicAuditor = Depends(get_forensic_auditor)
 ):
     """
     Combined endpoint: extracts data and analyzes it in a single step.
@@ -305,9 +383,6 @@ async def extract_and_analyze(
         tenant_id: Tenant ID (required for Xero and QuickBooks)
         use_ai: If True, uses Financial Analysis Agent, if False uses Forensic Auditor
     """
-    if not research_agent:
-        raise HTTPException(status_code=503, detail="Research Agent not initialized")
-    
     try:
         # Extract data
         if source == "xero":
@@ -323,35 +398,31 @@ async def extract_and_analyze(
         else:
             raise HTTPException(400, f"Unsupported source: {source}")
         
-        # Convertir a LoanRecord objects
-        loans = [LoanRecord(**loan) for loan in loans_data]
+        # Convertir a LoanRecord objects (batched validation)
+        loans = _LOANS_ADAPTER.validate_python(loans_data)
         
         # Analyze
-        latest_assessment = osint_scout.get_latest_assessment() if osint_scout else None
-        risk_context = {
-            "global_risk_score": latest_assessment.global_risk_score if latest_assessment else 0,
-            "affected_sectors": latest_assessment.affected_sectors if latest_assessment else [],
-            "sentiment": latest_assessment.sentiment if latest_assessment else "neutral",
-            "correlated_event": "Current geopolitical events"
-        }
-        
-        if use_ai and financial_agent:
+        risk_context = _current_risk_context(osint_scout)
+
+        if use_ai:
             flagged = await financial_agent.analyze_portfolio(loans, risk_context)
+            ranked = forensic_auditor.rank_and_dump(flagged)
         else:
-            flagged = forensic_auditor.flag_high_risk_loans(
+            # Synchronous auditor work runs in a thread to keep the loop free
+            flagged = await asyncio.to_thread(
+                forensic_auditor.flag_high_risk_loans,
                 loans,
                 risky_sectors=["energy", "currency", "sovereign debt"],
                 correlated_event=risk_context.get("correlated_event", "Geopolitical crisis")
             )
-        
-        ranked = forensic_auditor.rank_by_exposure(flagged)
-        
+            ranked = await asyncio.to_thread(forensic_auditor.rank_and_dump, flagged)
+
         return {
             "source": source,
             "extracted_count": len(loans),
             "flagged_count": len(flagged),
             "analysis_method": "ai" if use_ai else "traditional",
-            "flagged_loans": [loan.model_dump() for loan in ranked]
+            "flagged_loans": ranked
         }
     except HTTPException:
         raise
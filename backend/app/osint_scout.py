@@ -3,12 +3,12 @@ OSINT Scout agent for geopolitical intelligence gathering.
 """
 import logging
 import json
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Literal, Optional
 from pathlib import Path
 from app.models import NewsArticle, RiskAssessment
 from app.you_client import YouAPIClient
-from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +32,15 @@ class OSINTScout:
         'positive': ['growth', 'recovery', 'improvement', 'stability', 'agreement', 'resolution']
     }
     
+    # How long to wait before retrying a disk load of the latest assessment
+    ASSESSMENT_RELOAD_TTL_SECONDS = 5.0
+
     def __init__(self, you_client: YouAPIClient, storage_path: str = "data"):
         self.you_client = you_client
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True)
         self.latest_assessment: Optional[RiskAssessment] = None
+        self._last_load_attempt: float = 0.0
         
     async def scan_geopolitical_events(self, sectors: List[str] = None) -> RiskAssessment:
         """
@@ -91,8 +95,9 @@ class OSINTScout:
         # Persist assessment
         await self.persist_risk_score(assessment)
         
-        # Store as latest
+        # Store as latest (also invalidates the disk-reload TTL)
         self.latest_assessment = assessment
+        self._last_load_attempt = 0.0
         
         logger.info(f"Scan complete. Risk Score: {risk_score:.2f}, Sentiment: {sentiment}")
         
@@ -260,13 +265,22 @@ class OSINTScout:
     def get_latest_assessment(self) -> Optional[RiskAssessment]:
         """
         Retrieve the latest risk assessment.
-        
+
+        The in-memory assessment (refreshed by each scan) is returned
+        directly; the disk fallback is only retried after a short TTL so
+        every API request between scans doesn't hit the filesystem.
+
         Returns:
             Latest RiskAssessment or None if not available
         """
         if self.latest_assessment:
             return self.latest_assessment
-        
+
+        now = time.monotonic()
+        if now - self._last_load_attempt < self.ASSESSMENT_RELOAD_TTL_SECONDS:
+            return None
+        self._last_load_attempt = now
+
         # Try to load from file
         try:
             latest_path = self.storage_path / "latest_assessment.json"
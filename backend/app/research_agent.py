@@ -1,7 +1,11 @@
 """
 Research Agent: Extracts financial data using Composio MCP
 """
+import asyncio
 import logging
+import re
+import sys
+from collections import defaultdict
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -16,6 +20,33 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# datetime.fromisoformat accepts a trailing 'Z' natively on Python 3.11+
+_ISO_Z_OK = sys.version_info >= (3, 11)
+
+# Cheap shape check so malformed dates skip the exception path entirely
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# Precompiled patterns for interest type inference; IGNORECASE avoids a
+# per-transaction .lower() allocation
+_PIK_RE = re.compile(r'\b(pik|payment-in-kind)\b', re.IGNORECASE)
+_HYBRID_RE = re.compile(r'\bhybrid\b', re.IGNORECASE)
+
+# Interning pools: interest types and industries repeat across thousands of
+# records, so share one string object per distinct value instead of a fresh
+# copy per loan (also makes equality checks pointer comparisons)
+_INTEREST_POOL = {name: sys.intern(name) for name in ("PIK", "Cash", "Hybrid")}
+_INDUSTRY_POOL: Dict[str, str] = {}
+
+
+def _intern_interest_type(raw: str) -> str:
+    """Return the pooled string for an interest type value."""
+    return _INTEREST_POOL.get(raw) or _INTEREST_POOL.setdefault(raw, sys.intern(raw))
+
+
+def _intern_industry(raw: str) -> str:
+    """Return the pooled string for an industry name."""
+    return _INDUSTRY_POOL.get(raw) or _INDUSTRY_POOL.setdefault(raw, sys.intern(raw))
+
 
 class ResearchAgent:
     """Agent that extracts financial data from multiple sources using Composio."""
@@ -50,18 +81,19 @@ class ResearchAgent:
                 app=xero_app
             )
             
-            # Extract contacts (clients) and invoices
-            contacts = await self.toolset.execute_action(
-                action=Action.XERO_GET_CONTACTS,
-                connection=connection,
-                params={"tenant_id": tenant_id}
-            )
-            
-            # Extract financial transactions
-            transactions = await self.toolset.execute_action(
-                action=Action.XERO_GET_TRANSACTIONS,
-                connection=connection,
-                params={"tenant_id": tenant_id}
+            # Extract contacts (clients) and transactions concurrently:
+            # both calls are independent network requests
+            contacts, transactions = await asyncio.gather(
+                self.toolset.execute_action(
+                    action=Action.XERO_GET_CONTACTS,
+                    connection=connection,
+                    params={"tenant_id": tenant_id}
+                ),
+                self.toolset.execute_action(
+                    action=Action.XERO_GET_TRANSACTIONS,
+                    connection=connection,
+                    params={"tenant_id": tenant_id}
+                )
             )
             
             # Convert to LoanRecord format
@@ -95,18 +127,19 @@ class ResearchAgent:
                 app=quickbooks_app
             )
             
-            # Extract accounts receivable (AR = loans)
-            accounts_receivable = await self.toolset.execute_action(
-                action=Action.QUICKBOOKS_GET_ACCOUNTS_RECEIVABLE,
-                connection=connection,
-                params={"company_id": company_id}
-            )
-            
-            # Extract loan transactions
-            loans_data = await self.toolset.execute_action(
-                action=Action.QUICKBOOKS_GET_LOANS,
-                connection=connection,
-                params={"company_id": company_id}
+            # Extract accounts receivable (AR = loans) and loan
+            # transactions concurrently: both calls are independent
+            accounts_receivable, loans_data = await asyncio.gather(
+                self.toolset.execute_action(
+                    action=Action.QUICKBOOKS_GET_ACCOUNTS_RECEIVABLE,
+                    connection=connection,
+                    params={"company_id": company_id}
+                ),
+                self.toolset.execute_action(
+                    action=Action.QUICKBOOKS_GET_LOANS,
+                    connection=connection,
+                    params={"company_id": company_id}
+                )
             )
             
             loans = self._convert_quickbooks_to_loans(accounts_receivable, loans_data)
@@ -137,16 +170,17 @@ class ResearchAgent:
                 app=stripe_app
             )
             
-            # Extract balances and transactions
-            balance = await self.toolset.execute_action(
-                action=Action.STRIPE_GET_BALANCE,
-                connection=connection
-            )
-            
-            # Extract customer payment methods (may represent loans)
-            customers = await self.toolset.execute_action(
-                action=Action.STRIPE_GET_CUSTOMERS,
-                connection=connection
+            # Extract balances and customers concurrently:
+            # both calls are independent network requests
+            balance, customers = await asyncio.gather(
+                self.toolset.execute_action(
+                    action=Action.STRIPE_GET_BALANCE,
+                    connection=connection
+                ),
+                self.toolset.execute_action(
+                    action=Action.STRIPE_GET_CUSTOMERS,
+                    connection=connection
+                )
             )
             
             loans = self._convert_stripe_to_loans(customers, balance)
@@ -160,24 +194,24 @@ class ResearchAgent:
     def _convert_xero_to_loans(self, contacts: List, transactions: List) -> List[Dict]:
         """Convert Xero data to LoanRecord format."""
         loans = []
+        now = datetime.now()  # shared fallback for transactions without dates
         # Xero-specific conversion logic
-        # Map contacts and transactions to loans
+        # Group transactions by contact once, so matching each contact is an
+        # O(1) lookup instead of a scan over every transaction
+        transactions_by_contact = defaultdict(list)
+        for trans in transactions:
+            transactions_by_contact[trans.get('contact_id')].append(trans)
+
         for contact in contacts:
-            # Find related transactions
-            related_transactions = [
-                t for t in transactions 
-                if t.get('contact_id') == contact.get('id')
-            ]
-            
-            for trans in related_transactions:
+            for trans in transactions_by_contact.get(contact.get('id'), ()):
                 loan = {
                     'loanId': f"XERO_{contact.get('id')}_{trans.get('id')}",
                     'borrower': contact.get('name', 'Unknown'),
-                    'industry': contact.get('industry', 'general'),
+                    'industry': _intern_industry(contact.get('industry', 'general')),
                     'interestType': self._infer_interest_type(trans),
                     'principalAmount': float(trans.get('total', 0)),
                     'outstandingBalance': float(trans.get('amount_due', 0)),
-                    'maturityDate': self._parse_date(trans.get('due_date')),
+                    'maturityDate': self._parse_date(trans.get('due_date'), default=now),
                     'covenants': []
                 }
                 loans.append(loan)
@@ -187,16 +221,17 @@ class ResearchAgent:
     def _convert_quickbooks_to_loans(self, ar_data: List, loans_data: List) -> List[Dict]:
         """Convert QuickBooks data to LoanRecord format."""
         loans = []
+        now = datetime.now()  # shared fallback for loans without dates
         # QuickBooks conversion logic
         for loan_item in loans_data:
             loan = {
                 'loanId': f"QB_{loan_item.get('id')}",
                 'borrower': loan_item.get('customer_name', 'Unknown'),
-                'industry': loan_item.get('industry', 'general'),
-                'interestType': loan_item.get('interest_type', 'Cash'),
+                'industry': _intern_industry(loan_item.get('industry', 'general')),
+                'interestType': _intern_interest_type(loan_item.get('interest_type', 'Cash')),
                 'principalAmount': float(loan_item.get('principal', 0)),
                 'outstandingBalance': float(loan_item.get('balance', 0)),
-                'maturityDate': self._parse_date(loan_item.get('maturity_date')),
+                'maturityDate': self._parse_date(loan_item.get('maturity_date'), default=now),
                 'covenants': loan_item.get('covenants', [])
             }
             loans.append(loan)
@@ -206,6 +241,7 @@ class ResearchAgent:
     def _convert_stripe_to_loans(self, customers: List, balance: Dict) -> List[Dict]:
         """Convert Stripe data to LoanRecord format."""
         loans = []
+        now = datetime.now()
         # Stripe generally doesn't handle loans directly
         # But we can map pending balances as loans
         for customer in customers:
@@ -217,7 +253,7 @@ class ResearchAgent:
                     'interestType': 'Cash',
                     'principalAmount': float(customer.get('balance', 0)),
                     'outstandingBalance': float(customer.get('balance', 0)),
-                    'maturityDate': datetime.now(),  # Stripe doesn't have maturity dates
+                    'maturityDate': now,  # Stripe doesn't have maturity dates
                     'covenants': []
                 }
                 loans.append(loan)
@@ -227,19 +263,25 @@ class ResearchAgent:
     def _infer_interest_type(self, transaction: Dict) -> str:
         """Infer interest type from transaction data."""
         # Logic to determine if it's PIK, Cash or Hybrid
-        description = transaction.get('description', '').lower()
-        if 'pik' in description or 'payment-in-kind' in description:
+        description = transaction.get('description', '')
+        if _PIK_RE.search(description):
             return 'PIK'
-        elif 'hybrid' in description:
+        elif _HYBRID_RE.search(description):
             return 'Hybrid'
         else:
             return 'Cash'
     
-    def _parse_date(self, date_str: Optional[str]) -> datetime:
-        """Parse date from string."""
-        if not date_str:
-            return datetime.now()
+    def _parse_date(
+        self,
+        date_str: Optional[str],
+        default: Optional[datetime] = None
+    ) -> datetime:
+        """Parse an ISO-8601 date string, falling back to `default` (or now)."""
+        if not date_str or not _ISO_DATE_RE.match(date_str):
+            return default if default is not None else datetime.now()
         try:
+            if _ISO_Z_OK:
+                return datetime.fromisoformat(date_str)
             return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except:
-            return datetime.now()
+        except ValueError:
+            return default if default is not None else datetime.now()
@@ -6,7 +6,7 @@ import asyncio
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from app.osint_scout import OSINTScout
-from app.config import settings
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +39,7 @@ class ScanScheduler:
         # Add job with interval trigger
         self.scheduler.add_job(
             self.scan_job,
-            trigger=IntervalTrigger(minutes=settings.scan_interval_minutes),
+            trigger=IntervalTrigger(minutes=get_settings().scan_interval_minutes),
             id='osint_scan',
             name='OSINT Geopolitical Scan',
             replace_existing=True
@@ -49,7 +49,7 @@ class ScanScheduler:
         self.is_running = True
         
         logger.info(
-            f"Scheduler started. Scans will run every {settings.scan_interval_minutes} minutes"
+            f"Scheduler started. Scans will run every {get_settings().scan_interval_minutes} minutes"
         )
     
     def stop(self):
@@ -6,7 +6,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from app.models import NewsArticle
-from app.config import settings
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,7 @@ class YouAPIClient:
         self.api_key = api_key
         self.base_url = "https://ydc-index.io/v1"
         self.cache: Dict[str, tuple[List[NewsArticle], datetime]] = {}
-        self.cache_ttl = timedelta(seconds=settings.cache_ttl_seconds)
+        self.cache_ttl = timedelta(seconds=get_settings().cache_ttl_seconds)
         
     def _is_cache_valid(self, query: str) -> bool:
         """Check if cached data for query is still valid."""
@@ -4,7 +4,9 @@ Test script to verify You.com API connection with real API key.
 """
 import asyncio
 from app.you_client import YouAPIClient
-from app.config import settings
+from app.config import get_settings
+
+settings = get_settings()
 
 async def test_you_api():
     """Test You.com API connection."""
@@ -0,0 +1,183 @@
+"""
+Unit tests for Financial Analysis Agent.
+"""
+import asyncio
+
+import pytest
+from datetime import datetime
+
+from app.financial_analysis_agent import FinancialAnalysisAgent
+from app.models import LoanRecord, FlaggedLoan
+
+
+@pytest.fixture
+def agent():
+    """Create a FinancialAnalysisAgent instance."""
+    return FinancialAnalysisAgent()
+
+
+@pytest.fixture
+def sample_loans():
+    """Create sample loan records covering the main risk combinations."""
+    return [
+        LoanRecord(
+            loanId="L001",
+            borrower="Acme Energy",
+            industry="energy",
+            interestType="PIK",
+            principalAmount=10000000,
+            outstandingBalance=12500000,
+            maturityDate=datetime(2025, 12, 31),
+            covenants=["debt-to-equity < 2.0"]
+        ),
+        LoanRecord(
+            loanId="L002",
+            borrower="Global Mining",
+            industry="mining",
+            interestType="Cash",
+            principalAmount=5000000,
+            outstandingBalance=5200000,
+            maturityDate=datetime(2024, 6, 30),
+            covenants=[]
+        ),
+        LoanRecord(
+            loanId="L003",
+            borrower="LatAm Telecom",
+            industry="currency",
+            interestType="PIK",
+            principalAmount=8000000,
+            outstandingBalance=9500000,
+            maturityDate=datetime(2025, 3, 15),
+            covenants=[]
+        ),
+        LoanRecord(
+            loanId="L004",
+            borrower="Safe Retail",
+            industry="retail",
+            interestType="Cash",
+            principalAmount=1000000,
+            outstandingBalance=800000,
+            maturityDate=datetime(2026, 1, 1),
+            covenants=[]
+        )
+    ]
+
+
+@pytest.fixture
+def calm_context():
+    """Risk context with no elevating signals."""
+    return {
+        "global_risk_score": 30,
+        "affected_sectors": [],
+        "sentiment": "neutral",
+        "correlated_event": "None"
+    }
+
+
+@pytest.fixture
+def crisis_context():
+    """Risk context with all elevating signals active."""
+    return {
+        "global_risk_score": 85,
+        "affected_sectors": ["energy", "currency"],
+        "sentiment": "critical",
+        "correlated_event": "Middle East energy crisis"
+    }
+
+
+class TestLoanAnalysisLogic:
+    """Tests for the per-loan rule logic."""
+
+    def test_pik_loan_is_high_risk(self, agent, sample_loans, calm_context):
+        """PIK loans should be at least high risk."""
+        analysis = agent._analyze_loan_logic(sample_loans[2], calm_context)
+        assert analysis['risk_level'] == 'high'
+        assert analysis['is_pik_risk'] is True
+
+    def test_pik_with_high_balance_is_critical(self, agent, sample_loans, calm_context):
+        """PIK + balance above 10M should escalate to critical."""
+        analysis = agent._analyze_loan_logic(sample_loans[0], calm_context)
+        assert analysis['risk_level'] == 'critical'
+
+    def test_safe_loan_is_low_risk(self, agent, sample_loans, calm_context):
+        """Small cash loan in a calm context should stay low risk."""
+        analysis = agent._analyze_loan_logic(sample_loans[3], calm_context)
+        assert analysis['risk_level'] == 'low'
+
+    def test_context_escalates_risk(self, agent, sample_loans, crisis_context):
+        """Elevating context should push a moderate loan to high risk."""
+        analysis = agent._analyze_loan_logic(sample_loans[1], crisis_context)
+        assert analysis['risk_level'] == 'high'
+
+
+class TestVectorizedPortfolio:
+    """Tests for the vectorized portfolio analysis path."""
+
+    def test_flags_high_risk_loans(self, agent, sample_loans, calm_context):
+        """Vectorized analysis should flag PIK and high-balance loans."""
+        flagged = agent.analyze_portfolio_vectorized(sample_loans, calm_context)
+
+        flagged_ids = [loan.loan_id for loan in flagged]
+        assert flagged_ids == ["L001", "L003"]
+        assert all(isinstance(loan, FlaggedLoan) for loan in flagged)
+        assert flagged[0].risk_level == "critical"
+        assert flagged[1].risk_level == "high"
+
+    def test_empty_portfolio(self, agent, calm_context):
+        """Empty portfolio should produce no flags."""
+        assert agent.analyze_portfolio_vectorized([], calm_context) == []
+
+    def test_matches_scalar_logic(self, agent, sample_loans, crisis_context):
+        """Vectorized path should agree with the per-loan rule logic."""
+        flagged = agent.analyze_portfolio_vectorized(sample_loans, crisis_context)
+        flagged_by_id = {loan.loan_id: loan for loan in flagged}
+
+        for loan in sample_loans:
+            analysis = agent._analyze_loan_logic(loan, crisis_context)
+            if analysis['risk_level'] in ['high', 'critical']:
+                assert loan.loan_id in flagged_by_id
+                assert flagged_by_id[loan.loan_id].risk_level == analysis['risk_level']
+            else:
+                assert loan.loan_id not in flagged_by_id
+
+    def test_flagged_loan_attributes(self, agent, sample_loans, crisis_context):
+        """Flagged loans should carry reason, level and correlated event."""
+        flagged = agent.analyze_portfolio_vectorized(sample_loans, crisis_context)
+
+        assert len(flagged) > 0
+        loan = flagged[0]
+        assert loan.flag_reason
+        assert loan.risk_level in ['high', 'critical']
+        assert loan.correlated_event == "Middle East energy crisis"
+        assert isinstance(loan.flagged_at, datetime)
+
+
+class TestPortfolioFastPaths:
+    """Tests for the analyze_portfolio fast-return specializations."""
+
+    def test_empty_portfolio_returns_immediately(self, agent, calm_context):
+        """Empty portfolios should short-circuit to an empty result."""
+        flagged = asyncio.run(agent.analyze_portfolio([], calm_context))
+        assert flagged == []
+
+    def test_clean_portfolio_benign_context(self, agent, sample_loans, calm_context):
+        """Non-PIK loans below 10M in a calm context cannot be flagged."""
+        clean_loans = [loan for loan in sample_loans if loan.interest_type != 'PIK']
+        flagged = asyncio.run(agent.analyze_portfolio(clean_loans, calm_context))
+        assert flagged == []
+
+    def test_fast_path_does_not_drop_flags(self, agent, sample_loans, calm_context):
+        """PIK loans must still be flagged in a calm context."""
+        flagged = asyncio.run(agent.analyze_portfolio(sample_loans, calm_context))
+        assert [loan.loan_id for loan in flagged] == ["L001", "L003"]
+
+    def test_elevating_context_disables_prefilter(self, agent, sample_loans, crisis_context):
+        """With an elevating context, all loans go through the full pass."""
+        flagged = asyncio.run(agent.analyze_portfolio(sample_loans, crisis_context))
+        flagged_ids = {loan.loan_id for loan in flagged}
+        # L002 is Cash/5.2M but reaches high via risk score + critical sentiment
+        assert "L002" in flagged_ids
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
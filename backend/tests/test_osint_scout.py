@@ -155,5 +155,55 @@ class TestRecencyWeight:
         assert weight_week == 0.1  # Minimum weight
 
 
+class TestLatestAssessmentCache:
+    """Test caching of the latest risk assessment."""
+
+    def _write_assessment(self, storage_path):
+        """Write a latest_assessment.json into the storage directory."""
+        import json
+        assessment = RiskAssessment(
+            timestamp=datetime.now(),
+            global_risk_score=55.0,
+            affected_sectors=["energy"],
+            source_articles=[],
+            sentiment="neutral"
+        )
+        with open(storage_path / "latest_assessment.json", 'w') as f:
+            json.dump(assessment.model_dump(mode='json'), f)
+        return assessment
+
+    def test_in_memory_assessment_returned(self, tmp_path):
+        """An in-memory assessment should be returned without touching disk."""
+        scout = OSINTScout(you_client=None, storage_path=str(tmp_path))
+        assessment = self._write_assessment(tmp_path)
+        scout.latest_assessment = assessment
+
+        assert scout.get_latest_assessment() is assessment
+
+    def test_disk_load_fallback(self, tmp_path):
+        """With no in-memory assessment, it should be loaded from disk."""
+        scout = OSINTScout(you_client=None, storage_path=str(tmp_path))
+        self._write_assessment(tmp_path)
+
+        loaded = scout.get_latest_assessment()
+        assert loaded is not None
+        assert loaded.global_risk_score == 55.0
+
+    def test_disk_retry_is_throttled(self, tmp_path):
+        """Repeated misses should not retry the disk load within the TTL."""
+        scout = OSINTScout(you_client=None, storage_path=str(tmp_path))
+
+        # First call misses (no file) and arms the TTL
+        assert scout.get_latest_assessment() is None
+
+        # File appears, but within the TTL the miss is still served
+        self._write_assessment(tmp_path)
+        assert scout.get_latest_assessment() is None
+
+        # Once the TTL has elapsed, the file is picked up
+        scout._last_load_attempt -= scout.ASSESSMENT_RELOAD_TTL_SECONDS
+        assert scout.get_latest_assessment() is not None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,140 @@
+"""
+Unit tests for Research Agent data conversion helpers.
+"""
+import pytest
+from datetime import datetime
+
+from app.research_agent import ResearchAgent
+
+
+@pytest.fixture
+def agent():
+    """Create a ResearchAgent without touching Composio.
+
+    The conversion helpers don't use the Composio client, so the instance
+    is created without running __init__ (which requires composio-core).
+    """
+    return ResearchAgent.__new__(ResearchAgent)
+
+
+@pytest.fixture
+def xero_contacts():
+    """Sample Xero contacts."""
+    return [
+        {"id": "C1", "name": "Acme Energy", "industry": "energy"},
+        {"id": "C2", "name": "Global Mining", "industry": "mining"},
+        {"id": "C3", "name": "No Transactions Ltd", "industry": "retail"}
+    ]
+
+
+@pytest.fixture
+def xero_transactions():
+    """Sample Xero transactions linked to the contacts above."""
+    return [
+        {
+            "id": "T1", "contact_id": "C1", "total": 1000000,
+            "amount_due": 750000, "due_date": "2025-06-30T00:00:00Z",
+            "description": "PIK facility drawdown"
+        },
+        {
+            "id": "T2", "contact_id": "C1", "total": 500000,
+            "amount_due": 100000, "due_date": "2025-01-31T00:00:00Z",
+            "description": "Standard invoice"
+        },
+        {
+            "id": "T3", "contact_id": "C2", "total": 250000,
+            "amount_due": 250000, "due_date": None,
+            "description": "Hybrid note"
+        },
+        {
+            "id": "T4", "contact_id": "UNKNOWN", "total": 99,
+            "amount_due": 99, "due_date": None,
+            "description": "Orphan transaction"
+        }
+    ]
+
+
+class TestXeroConversion:
+    """Tests for Xero data conversion."""
+
+    def test_groups_transactions_by_contact(self, agent, xero_contacts, xero_transactions):
+        """Each contact should get one loan per related transaction."""
+        loans = agent._convert_xero_to_loans(xero_contacts, xero_transactions)
+
+        loan_ids = [loan['loanId'] for loan in loans]
+        assert loan_ids == ["XERO_C1_T1", "XERO_C1_T2", "XERO_C2_T3"]
+
+    def test_loan_fields_from_transaction(self, agent, xero_contacts, xero_transactions):
+        """Loan fields should be populated from contact and transaction."""
+        loans = agent._convert_xero_to_loans(xero_contacts, xero_transactions)
+
+        loan = loans[0]
+        assert loan['borrower'] == "Acme Energy"
+        assert loan['industry'] == "energy"
+        assert loan['interestType'] == "PIK"
+        assert loan['principalAmount'] == 1000000.0
+        assert loan['outstandingBalance'] == 750000.0
+        assert isinstance(loan['maturityDate'], datetime)
+
+    def test_contact_without_transactions(self, agent, xero_contacts, xero_transactions):
+        """Contacts without transactions should not produce loans."""
+        loans = agent._convert_xero_to_loans(xero_contacts, xero_transactions)
+        assert not any("C3" in loan['loanId'] for loan in loans)
+
+    def test_empty_inputs(self, agent):
+        """Empty contact/transaction lists should yield no loans."""
+        assert agent._convert_xero_to_loans([], []) == []
+
+
+class TestInterestTypeInference:
+    """Tests for interest type inference."""
+
+    def test_pik_keywords(self, agent):
+        """PIK and payment-in-kind keywords should map to PIK."""
+        assert agent._infer_interest_type({"description": "PIK facility"}) == 'PIK'
+        assert agent._infer_interest_type({"description": "payment-in-kind note"}) == 'PIK'
+
+    def test_case_insensitive(self, agent):
+        """Keyword matching should ignore case."""
+        assert agent._infer_interest_type({"description": "pik loan"}) == 'PIK'
+        assert agent._infer_interest_type({"description": "HYBRID structure"}) == 'Hybrid'
+
+    def test_whole_words_only(self, agent):
+        """Keywords embedded in other words should not match."""
+        assert agent._infer_interest_type({"description": "pikachu merch order"}) == 'Cash'
+
+    def test_defaults_to_cash(self, agent):
+        """Anything else should default to Cash."""
+        assert agent._infer_interest_type({"description": "Standard invoice"}) == 'Cash'
+        assert agent._infer_interest_type({}) == 'Cash'
+
+
+class TestDateParsing:
+    """Tests for date parsing."""
+
+    def test_parse_iso_zulu_date(self, agent):
+        """Should parse ISO dates with a trailing Z."""
+        parsed = agent._parse_date("2025-06-30T00:00:00Z")
+        assert parsed.year == 2025
+        assert parsed.month == 6
+
+    def test_parse_empty_date(self, agent):
+        """Empty dates should fall back to the current time."""
+        parsed = agent._parse_date(None)
+        assert isinstance(parsed, datetime)
+        assert (datetime.now() - parsed).total_seconds() < 1
+
+    def test_parse_invalid_date_uses_default(self, agent):
+        """Malformed dates should fall back to the provided default."""
+        default = datetime(2024, 1, 1)
+        assert agent._parse_date("not-a-date", default=default) is default
+        assert agent._parse_date("2024-13-99T99:99:99", default=default) is default
+
+    def test_parse_empty_date_uses_default(self, agent):
+        """Missing dates should fall back to the provided default."""
+        default = datetime(2024, 1, 1)
+        assert agent._parse_date(None, default=default) is default
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])